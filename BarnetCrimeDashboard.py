@@ -1,70 +1,180 @@
 import os
+import io
+import re
+import time
 import json
+import functools
+import gzip
+import hashlib
+import pickle
+import tempfile
 import pandas as pd
-import ast
 import geopandas as gpd
+from shapely.strtree import STRtree
 import folium
+from folium.map import Layer
+from jinja2 import Template
 import numpy as np
+import orjson
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from folium.plugins import HeatMap, MarkerCluster
+from folium.elements import JSCSSMixin
+from folium.plugins import MarkerCluster
+from folium.utilities import image_to_url
 from dash import Dash, html, dcc
 from dash.dependencies import Input, Output, State
+from flask import Response
+from flask_caching import Cache
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 import logging
+import threading
+from collections import OrderedDict
 
 # Configure logging
 log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
 logging.basicConfig(level=log_level)
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so repeated requests reuse pooled keep-alive connections
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=3))
+
+# Local cache for downloaded files and the LSOA/ward join, so restarts skip the network and sjoin.
+# The cache is best-effort: if it can't be used the app downloads and joins as if it were empty.
+cache_dir = Path(os.getenv('CACHE_DIR', Path(__file__).resolve().parent / '.cache'))
+try:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+except OSError as e:
+    logger.warning(f"Cache directory {cache_dir} unavailable, continuing without a disk cache: {e}")
+
+# The LSOA GeoJSON carries crime counts that change upstream, so cached downloads are refreshed after this age
+geojson_cache_ttl = int(os.getenv('GEOJSON_CACHE_TTL', 24 * 60 * 60))
+
+# Write to a temporary file in the cache directory and rename it into place, so workers starting
+# together never read a half-written cache file
+def write_cache_file(path, data):
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write cache file {path}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+def load_geojson_bytes(url):
+    cache_path = cache_dir / f"{hashlib.sha1(url.encode()).hexdigest()}.geojson.gz"
+    try:
+        if time.time() - cache_path.stat().st_mtime < geojson_cache_ttl:
+            return gzip.decompress(cache_path.read_bytes())
+    except (OSError, EOFError) as e:
+        if cache_path.exists():
+            logger.warning(f"Ignoring unreadable cache file {cache_path}: {e}")
+    response = session.get(url)
+    response.raise_for_status()
+    write_cache_file(cache_path, gzip.compress(response.content))
+    return response.content
+
+lsoa_geojson_url = 'https://raw.githubusercontent.com/samab74/Barnet-Dashboard/main/lsoa_with_crime_counts.geojson'
+wards_geojson_url = 'https://raw.githubusercontent.com/samab74/Barnet-Dashboard/main/OSBoundaryLine%20-%20BarnetWards.geojson'
+crime_data_url = 'https://raw.githubusercontent.com/samab74/Barnet-Dashboard/main/barnet_crimes.csv'
+
+# Start the independent downloads together; the crime CSV keeps downloading while the GeoJSON is processed
+startup_executor = ThreadPoolExecutor(max_workers=3)
+lsoa_geojson_future = startup_executor.submit(load_geojson_bytes, lsoa_geojson_url)
+wards_geojson_future = startup_executor.submit(load_geojson_bytes, wards_geojson_url)
+crime_data_future = startup_executor.submit(pd.read_csv, crime_data_url)
+startup_executor.shutdown(wait=False)
+
 # Load the GeoJSON files
 try:
-    lsoa_geojson_url = 'https://raw.githubusercontent.com/samab74/Barnet-Dashboard/main/lsoa_with_crime_counts.geojson'
-    wards_geojson_url = 'https://raw.githubusercontent.com/samab74/Barnet-Dashboard/main/OSBoundaryLine%20-%20BarnetWards.geojson'
-    lsoa_geojson_data = requests.get(lsoa_geojson_url).json()
-    wards_geojson_data = requests.get(wards_geojson_url).json()
+    lsoa_geojson_bytes = lsoa_geojson_future.result()
+    wards_geojson_bytes = wards_geojson_future.result()
+    lsoa_geojson_data = orjson.loads(lsoa_geojson_bytes)
+    wards_geojson_data = orjson.loads(wards_geojson_bytes)
 except Exception as e:
     logger.error(f"Error loading GeoJSON files: {e}")
 
-# Convert GeoJSON to GeoDataFrames
-try:
-    lsoa_gdf = gpd.GeoDataFrame.from_features(lsoa_geojson_data["features"])
-    wards_gdf = gpd.GeoDataFrame.from_features(wards_geojson_data["features"])
-
-    # Ensure both GeoDataFrames use the same CRS (Coordinate Reference System)
-    lsoa_gdf = lsoa_gdf.set_crs("EPSG:4326")
-    wards_gdf = wards_gdf.set_crs("EPSG:4326")
+# Bump when the LSOA/ward join changes so older cached joins are not reused
+lsoa_wards_cache_version = 2
 
-    # Perform spatial join to map LSOAs to wards using the 'predicate' parameter
-    lsoa_wards_gdf = gpd.sjoin(lsoa_gdf, wards_gdf, how="left", predicate="intersects")
-
-    # Convert the result back to a DataFrame
-    df = pd.DataFrame(lsoa_wards_gdf.drop(columns='geometry'))
+# Convert GeoJSON to GeoDataFrames, or reuse the cached join from a previous run on the same GeoJSON
+try:
+    lsoa_wards_key = hashlib.sha1(f"{lsoa_wards_cache_version}:{len(lsoa_geojson_bytes)}:".encode())
+    lsoa_wards_key.update(lsoa_geojson_bytes)
+    lsoa_wards_key.update(wards_geojson_bytes)
+    lsoa_wards_cache_path = cache_dir / f"lsoa_wards_{lsoa_wards_key.hexdigest()}.pkl"
+    df = None
+    try:
+        df = pd.read_pickle(lsoa_wards_cache_path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache file {lsoa_wards_cache_path}: {e}")
+    if df is None:
+        # Let GDAL (via pyogrio) parse the raw GeoJSON into columnar geometry arrays
+        lsoa_gdf = gpd.read_file(io.BytesIO(lsoa_geojson_bytes), engine='pyogrio')
+        wards_gdf = gpd.read_file(io.BytesIO(wards_geojson_bytes), engine='pyogrio')
+
+        # Ensure both GeoDataFrames use the same CRS (Coordinate Reference System)
+        lsoa_gdf = lsoa_gdf.set_crs("EPSG:4326")
+        wards_gdf = wards_gdf.set_crs("EPSG:4326")
+
+        # Map LSOAs to the wards they intersect with a bulk STRtree query on the raw geometry arrays
+        lsoa_idx, ward_idx = STRtree(wards_gdf.geometry.values).query(lsoa_gdf.geometry.values, predicate="intersects")
+        matches = pd.Series(ward_idx, index=lsoa_idx, name='index_right')
+
+        # Left join the ward attributes back on, keeping LSOAs without a ward like sjoin(how="left")
+        df = (
+            pd.DataFrame(lsoa_gdf.drop(columns='geometry'))
+            .join(matches, how='left')
+            .join(pd.DataFrame(wards_gdf.drop(columns='geometry')), on='index_right', lsuffix='_left', rsuffix='_right')
+        )
+        write_cache_file(lsoa_wards_cache_path, pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+
+        # Joins cached for older GeoJSON or join code are never read again
+        for stale_path in cache_dir.glob('lsoa_wards_*.pkl'):
+            if stale_path != lsoa_wards_cache_path:
+                try:
+                    stale_path.unlink()
+                except OSError as e:
+                    logger.warning(f"Could not remove stale cache file {stale_path}: {e}")
 except Exception as e:
     logger.error(f"Error processing GeoDataFrames: {e}")
 
+# Store the repeated ward and LSOA names as categoricals so filters and groupbys work on integer codes,
+# and downcast the census counts to the smallest numeric types that hold them
+try:
+    for col in ['WardName', 'LSOA21NM']:
+        df[col] = df[col].astype('category')
+    for col in df.select_dtypes(include='float').columns:
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+except Exception as e:
+    logger.error(f"Error optimising LSOA data types: {e}")
+
 # Load crime dataset
 try:
-    crime_data_url = 'https://raw.githubusercontent.com/samab74/Barnet-Dashboard/main/barnet_crimes.csv'
-    crime_data = pd.read_csv(crime_data_url)
+    crime_data = crime_data_future.result()
 except Exception as e:
     logger.error(f"Error loading crime data: {e}")
 
-# Extract latitude and longitude
-def extract_lat_lon(location_str):
-    try:
-        location_dict = ast.literal_eval(str(location_str).replace('null', 'None'))
-        latitude = float(location_dict.get('latitude', None))
-        longitude = float(location_dict.get('longitude', None))
-        return pd.Series([latitude, longitude])
-    except (ValueError, SyntaxError):
-        return pd.Series([None, None])
+# Latitude/longitude inside a serialised location dict, quoted either way ('...' from repr or "..." from JSON)
+location_pattern = re.compile(
+    r"""['"]latitude['"]:\s*['"]?(?P<latitude>[-\d.]+).*?['"]longitude['"]:\s*['"]?(?P<longitude>[-\d.]+)""",
+    re.DOTALL
+)
 
+# Extract latitude and longitude from the serialised location dicts in one vectorised pass
 try:
-    crime_data[['latitude', 'longitude']] = crime_data['location'].apply(extract_lat_lon)
+    lat_lon = crime_data['location'].astype(str).str.extract(location_pattern)
+    crime_data[['latitude', 'longitude']] = lat_lon.apply(pd.to_numeric, errors='coerce').astype('float32')
     filtered_crime_data = crime_data.dropna(subset=['latitude', 'longitude'])
     crime_categories = ['All Crime'] + filtered_crime_data['category'].unique().tolist()
 except Exception as e:
@@ -143,8 +253,55 @@ variables_to_exclude = [
     'Does not apply_deprivation', 'index_right', 'ONSWardCode', 'WardName'
 ]
 
+# Numeric columns and display labels used by the callbacks
+numeric_cols = df.select_dtypes(include=[np.number]).columns
+display_names = {var: short_names.get(var, var) for var in df.columns}
+
+# Descending row order per numeric column, so the bar chart takes rows instead of re-sorting
+lsoa_sort_index = {col: np.argsort(-df[col].to_numpy(), kind='stable') for col in numeric_cols}
+
+# One row per LSOA, plus an index from upper-cased LSOA name to its row for the LSOA lookup
+df_unique = df.drop_duplicates(subset=['LSOA21NM']).reset_index(drop=True)
+lsoa_upper_index = {name.upper(): i for i, name in enumerate(df_unique['LSOA21NM']) if isinstance(name, str)}
+total_lsoas = df_unique['LSOA21NM'].nunique()  # Correctly count the number of unique LSOAs
+
+# Percentile buckets and colours for the LSOA variable map
+map_percentiles = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+map_colors = ['#800026', '#BD0026', '#E31A1C', '#FC4E2A', '#FD8D3C', '#FEB24C', '#FED976', '#FFEDA0', '#FFFFCC', '#FFFFFF']
+
+# Bounding box of the crime API query, and the grid and colour ramp (sparse to dense) of the crime density overlay.
+# Cells are 0.0005 degrees (~35-55 m), finer than the anonymised points police.uk snaps crimes to.
+barnet_bounds = [[51.55519092818953, -0.30557383443798025], [51.670170250593905, -0.12909406402138046]]
+crime_heatmap_cell_size = 0.0005
+crime_heatmap_bins = [
+    int(np.ceil((barnet_bounds[1][axis] - barnet_bounds[0][axis]) / crime_heatmap_cell_size)) for axis in range(2)
+]
+crime_heatmap_gradient = np.array([[255, 255, 178], [254, 204, 92], [253, 141, 60], [240, 59, 32], [189, 0, 38]])
+
+# Marker colour for each police.uk crime category; anything else is drawn black
+category_colors = {
+    'anti-social-behaviour': 'blue',
+    'burglary': 'purple',
+    'criminal-damage-arson': 'orange',
+    'drugs': 'darkred',
+    'other-theft': 'green',
+    'possession-of-weapons': 'cadetblue',
+    'public-order': 'lightred',
+    'robbery': 'darkpurple',
+    'shoplifting': 'lightblue',
+    'theft-from-the-person': 'darkgreen',
+    'vehicle-crime': 'black',
+    'violent-crime': 'red',
+    'other-crime': 'gray'
+}
+
+# Options shared by the variable dropdowns
+excluded_variables = set(variables_to_exclude)
+variable_options = [{'label': display_names[var], 'value': var} for var in df.columns if var not in excluded_variables]
+
 app = Dash(__name__)
 server = app.server
+cache = Cache(server, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 3600})
 
 app.layout = html.Div([
     html.H1("LSOA Dashboard", style={'textAlign': 'center', 'padding': '10px'}),
@@ -155,10 +312,7 @@ app.layout = html.Div([
                 html.Label("Select Variable for Map:"),
                 dcc.Dropdown(
                     id='map-variable-dropdown',
-                    options=[
-                        {'label': short_names.get(var, var), 'value': var} 
-                        for var in df.columns if var not in variables_to_exclude
-                    ],
+                    options=variable_options,
                     value='total_crime',  # Set default value
                     clearable=False
                 ),
@@ -176,10 +330,7 @@ app.layout = html.Div([
                 html.Label("Select Variable for Bar Charts:"),
                 dcc.Dropdown(
                     id='bar-variable-dropdown',
-                    options=[
-                        {'label': short_names.get(var, var), 'value': var} 
-                        for var in df.columns if var not in variables_to_exclude
-                    ],
+                    options=variable_options,
                     value='total_crime',  # Set default value
                     clearable=False
                 ),
@@ -201,6 +352,7 @@ app.layout = html.Div([
                     clearable=False
                 ),
                 html.Iframe(id='crime-map', width='100%', height='600', style={'border': 'none'}),
+                dcc.Store(id='crime-category-store'),
             ], style={'padding': '10px', 'border': '1px solid #ccc', 'border-radius': '5px', 'margin-bottom': '20px'}),
         ]),
         dcc.Tab(label='Correlations', children=[
@@ -208,10 +360,7 @@ app.layout = html.Div([
                 html.H2("Correlations with Total Crime", style={'textAlign': 'center', 'padding': '10px'}),
                 dcc.Dropdown(
                     id='correlation-variable-dropdown',
-                    options=[
-                        {'label': short_names.get(var, var), 'value': var} 
-                        for var in df.columns if var not in variables_to_exclude
-                    ],
+                    options=variable_options,
                     value='total_crime',  # Set default value
                     clearable=False
                 ),
@@ -232,19 +381,49 @@ app.layout = html.Div([
     ])
 ])
 
+# Parsed crime data per month; police.uk publishes monthly, so responses are reused for a day. The map callback
+# is already memoised by build_crime_map, so this mainly serves fetch_crime_data_many. Least recently used
+# months are evicted past the size limit, and a lock keeps the concurrent fetches from racing on the dict.
+crime_data_cache = OrderedDict()
+crime_data_cache_ttl = 24 * 60 * 60
+crime_data_cache_maxsize = 36
+crime_data_cache_lock = threading.Lock()
+
+# Street-level crime endpoint and the polygon around Barnet it is queried with
+crime_api_url = "https://data.police.uk/api/crimes-street/all-crime"
+crime_api_poly = "51.55519092818953,-0.30557383443798025:51.670170250593905,-0.30557383443798025:51.670170250593905,-0.12909406402138046:51.55519092818953,-0.12909406402138046:51.55519092818953,-0.30557383443798025"
+
 def fetch_crime_data(date):
-    coordinates = "51.55519092818953,-0.30557383443798025:51.670170250593905,-0.30557383443798025:51.670170250593905,-0.12909406402138046:51.55519092818953,-0.12909406402138046:51.55519092818953,-0.30557383443798025"
-    url = f"https://data.police.uk/api/crimes-street/all-crime?poly={coordinates}&date={date}"
+    with crime_data_cache_lock:
+        cached = crime_data_cache.pop(date, None)
+        if cached and time.time() - cached[0] < crime_data_cache_ttl:
+            crime_data_cache[date] = cached
+            return cached[1]
+
     try:
-        response = requests.get(url)
-        logger.info(f"API URL: {url}")
+        response = session.get(crime_api_url, params={'poly': crime_api_poly, 'date': date}, timeout=15)
+        logger.info(f"API URL: {response.url}")
         logger.info(f"API Response Status Code: {response.status_code}")
         if response.status_code == 200:
-            crimes = response.json()
+            crimes = orjson.loads(response.content)
             if crimes:
-                df = pd.DataFrame(crimes)
-                df[['latitude', 'longitude']] = df['location'].apply(extract_lat_lon)
-                return df.dropna(subset=['latitude', 'longitude'])
+                # Only the category and coordinates are needed, so pull them straight out of the parsed records
+                locations = [crime.get('location') or {} for crime in crimes]
+                categories = np.array([crime.get('category') for crime in crimes], dtype=object)
+                latitudes = pd.to_numeric([location.get('latitude') for location in locations], errors='coerce')
+                longitudes = pd.to_numeric([location.get('longitude') for location in locations], errors='coerce')
+                # Drop crimes without usable coordinates before the frame is built rather than copying it afterwards
+                mask = np.isfinite(latitudes) & np.isfinite(longitudes)
+                df = pd.DataFrame({
+                    'category': pd.Categorical(categories[mask]),
+                    'latitude': latitudes[mask],
+                    'longitude': longitudes[mask]
+                })
+                with crime_data_cache_lock:
+                    crime_data_cache[date] = (time.time(), df)
+                    while len(crime_data_cache) > crime_data_cache_maxsize:
+                        crime_data_cache.popitem(last=False)
+                return df
         else:
             logger.error(f"Error fetching crime data: {response.status_code}")
             logger.error(f"Response: {response.text}")
@@ -252,14 +431,189 @@ def fetch_crime_data(date):
         logger.error(f"Exception occurred while fetching crime data: {e}")
     return pd.DataFrame()
 
-def extract_lat_lon(location_str):
-    try:
-        location_dict = ast.literal_eval(str(location_str).replace('null', 'None'))
-        latitude = float(location_dict.get('latitude', None))
-        longitude = float(location_dict.get('longitude', None))
-        return pd.Series([latitude, longitude])
-    except (ValueError, SyntaxError):
-        return pd.Series([None, None])
+# Fetch several months concurrently over the shared session, e.g. for a date range
+def fetch_crime_data_many(dates):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # Failed months come back as empty, column-less frames, so leave them out of the concat
+        months = [month for month in executor.map(fetch_crime_data, dates) if not month.empty]
+    if not months:
+        return pd.DataFrame()
+    crime_data = pd.concat(months, ignore_index=True)
+    # Months with different category sets concatenate to plain strings, so re-encode once
+    crime_data['category'] = crime_data['category'].astype('category')
+    return crime_data
+
+# Legend for the crime map marker colours
+crime_legend_html = '''
+    <div style="position: fixed; 
+    bottom: 50px; left: 50px; width: 250px; height: auto; 
+    border:2px solid grey; z-index:9999; font-size:14px;
+    background-color:white;
+    padding: 10px;
+    border-radius: 5px;
+    box-shadow: 2px 2px 6px rgba(0,0,0,0.3);
+    ">
+    <h4 style="margin-top: 5px; text-align: center;">Crime Category Legend</h4>
+    <ul style="list-style-type:none; padding-left: 0;">
+        <li><span style="background-color: blue; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Anti-Social Behaviour</li>
+        <li><span style="background-color: purple; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Burglary</li>
+        <li><span style="background-color: orange; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Criminal Damage & Arson</li>
+        <li><span style="background-color: darkred; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Drugs</li>
+        <li><span style="background-color: green; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Other Theft</li>
+        <li><span style="background-color: cadetblue; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Possession of Weapons</li>
+        <li><span style="background-color: lightred; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Public Order</li>
+        <li><span style="background-color: darkpurple; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Robbery</li>
+        <li><span style="background-color: lightblue; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Shoplifting</li>
+        <li><span style="background-color: darkgreen; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Theft from the Person</li>
+        <li><span style="background-color: black; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Vehicle Crime</li>
+        <li><span style="background-color: red; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Violent Crime</li>
+        <li><span style="background-color: gray; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Other Crime</li>
+    </ul>
+    </div>
+    '''
+
+# Colour a grid of crime counts as an RGBA image
+def crime_density_image(counts):
+    # Log scale so a few hotspots don't wash out the rest of the borough
+    density = np.log1p(counts) / (np.log1p(counts.max()) or 1)
+    stops = np.linspace(0, 1, len(crime_heatmap_gradient))
+    rgba = np.zeros(counts.shape + (4,), dtype=np.uint8)
+    for channel in range(3):
+        rgba[..., channel] = np.interp(density, stops, crime_heatmap_gradient[:, channel])
+    rgba[..., 3] = np.where(counts > 0, 96 + 159 * density, 0)
+    return rgba
+
+# Density overlay (as a PNG data URL) for each category present in the month, plus 'All Crime'.
+# One histogramdd call bins every crime by category code and grid cell.
+def crime_density_images(latitudes, longitudes, category_codes, categories):
+    (lat_min, lon_min), (lat_max, lon_max) = barnet_bounds
+    counts, _ = np.histogramdd(
+        (category_codes, latitudes, longitudes),
+        bins=[len(categories)] + crime_heatmap_bins,
+        range=[(-0.5, len(categories) - 0.5), (lat_min, lat_max), (lon_min, lon_max)]
+    )
+    images = {'All Crime': image_to_url(crime_density_image(counts.sum(axis=0)), origin='lower')}
+    for category, category_counts in zip(categories, counts):
+        if category_counts.any():
+            images[category] = image_to_url(crime_density_image(category_counts), origin='lower')
+    return images
+
+# Crime markers and density overlay for a whole month. The map exposes window.setCrimeCategory so the
+# dashboard can switch category in the browser without re-rendering the map.
+class CrimeCategoryLayers(JSCSSMixin):
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            (function () {
+                var map = {{ this._parent.get_name() }};
+                map.setView({{ this.center|tojson }}, map.getZoom());
+                var points = {{ this.points|tojson }};
+                var categories = {{ this.categories|tojson }};
+                var colors = {{ this.colors|tojson }};
+                var densityImages = {{ this.density_images|tojson }};
+                var cluster = L.markerClusterGroup().addTo(map);
+                var density = L.imageOverlay(densityImages['All Crime'], {{ this.bounds|tojson }}, {opacity: 0.6}).addTo(map);
+
+                window.setCrimeCategory = function (category) {
+                    var code = categories.indexOf(category);
+                    var markers = [];
+                    for (var i = 0; i < points.length; i++) {
+                        var row = points[i];
+                        if (category === 'All Crime' || row[2] === code) {
+                            var icon = L.AwesomeMarkers.icon({icon: 'info-sign', prefix: 'glyphicon', markerColor: colors[row[2]]});
+                            markers.push(L.marker([row[0], row[1]], {icon: icon}).bindPopup('Category: ' + categories[row[2]]));
+                        }
+                    }
+                    cluster.clearLayers();
+                    cluster.addLayers(markers);
+
+                    var image = densityImages[category];
+                    if (image) {
+                        density.setUrl(image);
+                    }
+                    density.setOpacity(image ? 0.6 : 0);
+                };
+                window.setCrimeCategory({{ this.category|tojson }});
+            })();
+        {% endmacro %}
+    """)
+    default_js = MarkerCluster.default_js
+    default_css = MarkerCluster.default_css
+
+    def __init__(self, center, points, categories, colors, density_images, bounds, category):
+        super().__init__()
+        self._name = 'CrimeCategoryLayers'
+        self.center = center
+        self.points = points
+        self.categories = categories
+        self.colors = colors
+        self.density_images = density_images
+        self.bounds = bounds
+        self.category = category
+
+# Only the data changes between crime maps, so the map is rendered through Folium once with
+# placeholders and each month's data is substituted into that HTML
+crime_map_placeholders = ['center', 'points', 'categories', 'colors', 'density_images', 'category']
+
+@functools.lru_cache(maxsize=None)
+def crime_map_template():
+    map_barnet = folium.Map(location=np.mean(barnet_bounds, axis=0).tolist(), zoom_start=12)
+    CrimeCategoryLayers(
+        bounds=barnet_bounds,
+        **{name: f'__CRIME_{name.upper()}__' for name in crime_map_placeholders}
+    ).add_to(map_barnet)
+    map_barnet.get_root().html.add_child(folium.Element(crime_legend_html))
+    return map_barnet.get_root().render()
+
+# JSON for embedding in a <script> block, escaped like Jinja's tojson so values can't close the tag
+def script_safe_json(value):
+    return (
+        orjson.dumps(value).decode()
+        .replace('<', '\\u003c')
+        .replace('>', '\\u003e')
+        .replace('&', '\\u0026')
+        .replace("'", '\\u0027')
+    )
+
+# Substitute the given placeholder values into crime map HTML
+def crime_map_html(html_map, **values):
+    for name in values:
+        html_map = html_map.replace(f'"__CRIME_{name.upper()}__"', script_safe_json(values[name]))
+    return html_map
+
+crime_map_no_data = ("<h3>No crime data available for the selected date.</h3>", [{'label': 'All Crime', 'value': 'All Crime'}])
+
+# Crime map HTML and category options for a month, memoised so revisiting a date skips the rebuild. The initial
+# category placeholder is left in the cached HTML and filled per request. Failed or empty months aren't memoised,
+# so a transient API error doesn't stick for the cache timeout.
+# SimpleCache is per process; use RedisCache when running several gunicorn workers.
+@cache.memoize(response_filter=lambda result: result != crime_map_no_data)
+def build_crime_map(date):
+    crime_data = fetch_crime_data(date)
+
+    # Failed or empty months come back without any columns, so check before touching 'category'
+    if crime_data.empty:
+        return crime_map_no_data
+
+    crime_categories = ['All Crime'] + crime_data['category'].cat.categories.tolist()
+    dropdown_options = [{'label': crime_category, 'value': crime_category} for crime_category in crime_categories]
+
+    # The map carries every crime for the month; the category dropdown filters it client-side
+    coords = crime_data[['latitude', 'longitude']].to_numpy()
+    lat, lon = coords[:, 0], coords[:, 1]
+    category_codes = crime_data['category'].cat.codes.to_numpy()
+    categories = crime_data['category'].cat.categories.tolist()
+
+    html_map = crime_map_html(
+        crime_map_template(),
+        center=np.round(coords.mean(axis=0), 5).tolist(),
+        # 5 decimals is ~1 m, finer than police.uk's anonymised points, and keeps the payload small
+        points=list(zip(np.round(lat, 5).tolist(), np.round(lon, 5).tolist(), category_codes.tolist())),
+        categories=categories,
+        colors=[category_colors.get(category, 'black') for category in categories],
+        density_images=crime_density_images(lat, lon, category_codes, categories)
+    )
+
+    return html_map, dropdown_options
 
 @app.callback(
     [Output('crime-map', 'srcDoc'),
@@ -269,91 +623,25 @@ def extract_lat_lon(location_str):
 )
 def update_crime_map(n_clicks, date_input, selected_category):
     if n_clicks > 0 and date_input:
-        crime_data = fetch_crime_data(date_input)
-        
-        crime_categories = ['All Crime'] + crime_data['category'].unique().tolist()
-        dropdown_options = [{'label': category, 'value': category} for category in crime_categories]
-
-        if selected_category == 'All Crime':
-            filtered_data_by_category = crime_data
-        else:
-            filtered_data_by_category = crime_data[crime_data['category'] == selected_category]
-
-        if not filtered_data_by_category.empty:
-            center_lat, center_lon = filtered_data_by_category['latitude'].mean(), filtered_data_by_category['longitude'].mean()
-            map_barnet = folium.Map(location=[center_lat, center_lon], zoom_start=12)
-    
-            heat_data = [[row['latitude'], row['longitude']] for idx, row in filtered_data_by_category.iterrows()]
-            heatmap_layer = HeatMap(heat_data, name='Crime Heatmap').add_to(map_barnet)
-            marker_cluster = MarkerCluster(name='Crime Markers').add_to(map_barnet)
-    
-            def get_marker_color(crime_category):
-                category_colors = {
-                    'anti-social-behaviour': 'blue',
-                    'burglary': 'purple',
-                    'criminal-damage-arson': 'orange',
-                    'drugs': 'darkred',
-                    'other-theft': 'green',
-                    'possession-of-weapons': 'cadetblue',
-                    'public-order': 'lightred',
-                    'robbery': 'darkpurple',
-                    'shoplifting': 'lightblue',
-                    'theft-from-the-person': 'darkgreen',
-                    'vehicle-crime': 'black',
-                    'violent-crime': 'red',
-                    'other-crime': 'gray'
-                }
-                return category_colors.get(crime_category, 'black')
-    
-            for idx, row in filtered_data_by_category.iterrows():
-                folium.Marker(
-                    location=[row['latitude'], row['longitude']],
-                    popup=f'Category: {row["category"]}',
-                    icon=folium.Icon(color=get_marker_color(row['category']))
-                ).add_to(marker_cluster)
-    
-            # Updated Legend
-            legend_html = '''
-                <div style="position: fixed; 
-                bottom: 50px; left: 50px; width: 250px; height: auto; 
-                border:2px solid grey; z-index:9999; font-size:14px;
-                background-color:white;
-                padding: 10px;
-                border-radius: 5px;
-                box-shadow: 2px 2px 6px rgba(0,0,0,0.3);
-                ">
-                <h4 style="margin-top: 5px; text-align: center;">Crime Category Legend</h4>
-                <ul style="list-style-type:none; padding-left: 0;">
-                    <li><span style="background-color: blue; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Anti-Social Behaviour</li>
-                    <li><span style="background-color: purple; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Burglary</li>
-                    <li><span style="background-color: orange; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Criminal Damage & Arson</li>
-                    <li><span style="background-color: darkred; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Drugs</li>
-                    <li><span style="background-color: green; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Other Theft</li>
-                    <li><span style="background-color: cadetblue; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Possession of Weapons</li>
-                    <li><span style="background-color: lightred; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Public Order</li>
-                    <li><span style="background-color: darkpurple; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Robbery</li>
-                    <li><span style="background-color: lightblue; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Shoplifting</li>
-                    <li><span style="background-color: darkgreen; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Theft from the Person</li>
-                    <li><span style="background-color: black; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Vehicle Crime</li>
-                    <li><span style="background-color: red; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Violent Crime</li>
-                    <li><span style="background-color: gray; display: inline-block; width: 12px; height: 12px; margin-right: 5px;"></span> Other Crime</li>
-                </ul>
-                </div>
-                '''
-    
-            map_barnet.get_root().html.add_child(folium.Element(legend_html))
-    
-            crime_map_file_path = 'Barnet_Crime_Hotspots_Custom.html'
-            map_barnet.save(crime_map_file_path)
-    
-            with open(crime_map_file_path, 'r') as f:
-                html_map = f.read()
-    
-            return html_map, dropdown_options
-        else:
-            return "<h3>No crime data available for the selected date.</h3>", dropdown_options
+        html_map, dropdown_options = build_crime_map(date_input)
+        return crime_map_html(html_map, category=selected_category), dropdown_options
     return "", [{'label': 'All Crime', 'value': 'All Crime'}]
 
+# Switch the rendered crime map to the selected category inside its iframe, without a server round trip
+app.clientside_callback(
+    """
+    function (category) {
+        var frame = document.getElementById('crime-map');
+        if (frame && frame.contentWindow && frame.contentWindow.setCrimeCategory) {
+            frame.contentWindow.setCrimeCategory(category);
+        }
+        return category;
+    }
+    """,
+    Output('crime-category-store', 'data'),
+    [Input('crime-category-dropdown', 'value')]
+)
+
 @app.callback(
     Output('bar-chart', 'figure'),
     Output('ward-bar-chart', 'figure'),
@@ -365,7 +653,10 @@ def update_bar_charts(selected_variable):
         raise ValueError(f"Selected variable {selected_variable} does not exist in the DataFrame")
 
     # Sort the dataframe by the selected variable
-    sorted_df = df.sort_values(by=selected_variable, ascending=False)
+    if selected_variable in lsoa_sort_index:
+        sorted_df = df.iloc[lsoa_sort_index[selected_variable]]
+    else:
+        sorted_df = df.sort_values(by=selected_variable, ascending=False)
     
     # Update LSOA bar chart
     lsoa_fig = px.bar(
@@ -390,7 +681,7 @@ def update_bar_charts(selected_variable):
     )
     
     # Update Ward bar chart
-    ward_totals = df.groupby('WardName')[selected_variable].sum().reset_index()
+    ward_totals = df.groupby('WardName', observed=True)[selected_variable].sum().reset_index()
     ward_fig = px.bar(
         ward_totals,
         x='WardName',
@@ -408,6 +699,79 @@ def update_bar_charts(selected_variable):
     
     return lsoa_fig, ward_fig
 
+# Serve the downloaded boundary GeoJSON from its own URL so the browser downloads and caches the geometry once,
+# and each map callback only has to emit styles. Routes and URLs follow Dash's pathname prefix so they work behind a proxy.
+
+@server.route(f"{app.config.routes_pathname_prefix}lsoa.geojson")
+def serve_lsoa_geojson():
+    return Response(lsoa_geojson_bytes, mimetype='application/geo+json', headers={'Cache-Control': 'public, max-age=86400'})
+
+@server.route(f"{app.config.routes_pathname_prefix}wards.geojson")
+def serve_wards_geojson():
+    return Response(wards_geojson_bytes, mimetype='application/geo+json', headers={'Cache-Control': 'public, max-age=86400'})
+
+# GeoJSON layer that fetches its features from a URL in the browser. Per-feature fill colours are looked up
+# in `colors` by the `key_property` of each feature, so only that small table is embedded in the map HTML.
+class RemoteGeoJson(Layer):
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }}_colors = {{ this.colors|tojson }};
+            var {{ this.get_name() }}_tooltip_fields = {{ this.tooltip_fields|tojson }};
+            var {{ this.get_name() }}_tooltip_aliases = {{ this.tooltip_aliases|tojson }};
+            var {{ this.get_name() }} = L.geoJson(null, {
+                style: function(feature) {
+                    var style = Object.assign({}, {{ this.style|tojson }});
+                    {%- if this.key_property %}
+                    style.fillColor = {{ this.get_name() }}_colors[feature.properties[{{ this.key_property|tojson }}]];
+                    {%- endif %}
+                    return style;
+                },
+                onEachFeature: function(feature, layer) {
+                    layer.bindTooltip({{ this.get_name() }}_tooltip_fields.map(function(field, i) {
+                        return '<b>' + {{ this.get_name() }}_tooltip_aliases[i] + '</b> ' + feature.properties[field];
+                    }).join('<br>'), {sticky: true});
+                }
+            });
+            fetch({{ this.url|tojson }})
+                .then(function(response) { return response.json(); })
+                .then(function(data) {
+                    {{ this.get_name() }}.addData(data);
+                    {%- if this.bring_to_back %}
+                    {{ this.get_name() }}.bringToBack();
+                    {%- endif %}
+                });
+        {% endmacro %}
+    """)
+
+    def __init__(self, url, style, tooltip_fields, tooltip_aliases, colors=None, key_property=None,
+                 bring_to_back=False, name=None):
+        super().__init__(name=name, overlay=True)
+        self._name = 'RemoteGeoJson'
+        self.url = url
+        self.style = style
+        self.tooltip_fields = tooltip_fields
+        self.tooltip_aliases = tooltip_aliases
+        self.colors = colors or {}
+        self.key_property = key_property
+        self.bring_to_back = bring_to_back
+
+# Values of a variable for every LSOA feature, in feature order
+@functools.lru_cache(maxsize=None)
+def lsoa_variable_values(selected_variable):
+    features = lsoa_geojson_data['features']
+    return np.fromiter((f['properties'][selected_variable] for f in features), dtype=np.float32, count=len(features))
+
+# Percentile bucket colour of every LSOA feature for a variable, keyed by LSOA code
+@functools.lru_cache(maxsize=None)
+def lsoa_feature_colors(selected_variable):
+    values = lsoa_variable_values(selected_variable)
+    thresholds = np.percentile(values, map_percentiles)
+    color_indices = np.searchsorted(thresholds, values, side='left').clip(0, len(map_colors) - 1)
+    return {
+        feature['properties']['LSOA21CD']: map_colors[i]
+        for feature, i in zip(lsoa_geojson_data['features'], color_indices)
+    }
+
 @app.callback(
     Output('map', 'srcDoc'),
     [Input('map-variable-dropdown', 'value')]
@@ -416,27 +780,19 @@ def update_variable_map(selected_variable):
     m = folium.Map(location=[51.6, -0.2], zoom_start=12)
     
     if selected_variable:
-        values = [feature['properties'][selected_variable] for feature in lsoa_geojson_data['features']]
-        percentiles = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
-        colors = ['#800026', '#BD0026', '#E31A1C', '#FC4E2A', '#FD8D3C', '#FEB24C', '#FED976', '#FFEDA0', '#FFFFCC', '#FFFFFF']
-        thresholds = [np.percentile(values, p) for p in percentiles]
-        
-        def get_color(value):
-            for i, threshold in enumerate(thresholds):
-                if value <= threshold:
-                    return colors[i]
-            return colors[-1]
-        
-        folium.GeoJson(
-            lsoa_geojson_data,
+        RemoteGeoJson(
+            app.get_relative_path('/lsoa.geojson'),
             name='LSOA Variable',
-            style_function=lambda x: {
-                'fillColor': get_color(x['properties'][selected_variable]),
+            style={
                 'color': 'black',
                 'weight': 1,
                 'fillOpacity': 0.5,
             },
-            tooltip=folium.GeoJsonTooltip(fields=['LSOA21NM', selected_variable], aliases=['LSOA:', short_names.get(selected_variable, selected_variable)])
+            colors=lsoa_feature_colors(selected_variable),
+            key_property='LSOA21CD',
+            tooltip_fields=['LSOA21NM', selected_variable],
+            tooltip_aliases=['LSOA:', short_names.get(selected_variable, selected_variable)],
+            bring_to_back=True
         ).add_to(m)
         
         legend_html = '''
@@ -452,38 +808,38 @@ def update_variable_map(selected_variable):
         <ul style="list-style-type:none; padding-left: 0;">
         '''
         
-        for i, percentile in enumerate(percentiles):
-            color = colors[i]
+        for i, percentile in enumerate(map_percentiles):
+            color = map_colors[i]
             legend_html += f'<li><span style="background:{color}; width: 20px; height: 20px; display: inline-block;"></span> Top {percentile}%</li>'
         
         legend_html += '</ul></div>'
         
         m.get_root().html.add_child(folium.Element(legend_html))
     
-    ward_style_function = lambda x: {
-        'fillColor': 'none',
-        'color': 'black',
-        'weight': 3,
-        'fillOpacity': 0.5,
-    }
-    
-    folium.GeoJson(
-        wards_geojson_data,
+    RemoteGeoJson(
+        app.get_relative_path('/wards.geojson'),
         name='Electoral Wards',
-        style_function=ward_style_function,
-        tooltip=folium.GeoJsonTooltip(fields=['WardName'], aliases=['Ward:'])
+        style={
+            'fillColor': 'none',
+            'color': 'black',
+            'weight': 3,
+            'fillOpacity': 0.5,
+        },
+        tooltip_fields=['WardName'],
+        tooltip_aliases=['Ward:']
     ).add_to(m)
     
     folium.LayerControl().add_to(m)
     
-    map_file_path = 'lsoa_variable_map.html'
-    m.save(map_file_path)
-    
-    with open(map_file_path, 'r') as f:
-        html_map = f.read()
+    html_map = m.get_root().render()
     
     return html_map
 
+# Rank of every LSOA for a variable (1 = highest), in df_unique row order
+@functools.lru_cache(maxsize=None)
+def lsoa_ranks(selected_variable):
+    return df_unique[selected_variable].rank(method='min', ascending=False).to_numpy()
+
 @app.callback(
     Output('lsoa-info', 'children'),
     [Input('submit-button', 'n_clicks')],
@@ -494,22 +850,16 @@ def display_lsoa_info(n_clicks, lsoa_name, selected_variable):
         # Remove any leading/trailing spaces and convert to upper case for consistency
         lsoa_name = lsoa_name.strip().upper()
         
-        # Filter the DataFrame for the given LSOA name
-        lsoa_data = df[df['LSOA21NM'].str.contains(lsoa_name, case=False, na=False)]
+        # Look the LSOA up by exact name, falling back to a substring search
+        row = lsoa_upper_index.get(lsoa_name)
+        if row is None:
+            matches = np.flatnonzero(df_unique['LSOA21NM'].str.contains(lsoa_name, case=False, na=False, regex=False))
+            row = matches[0] if len(matches) else None
         
-        if not lsoa_data.empty:
-            value = lsoa_data[selected_variable].values[0]
-
-            # Remove duplicates
-            df_unique = df.drop_duplicates(subset=['LSOA21NM'])
-
-            # Compute the rank
-            df_sorted = df_unique.sort_values(by=selected_variable, ascending=False).reset_index(drop=True)
-            df_sorted['rank'] = df_sorted[selected_variable].rank(method='min', ascending=False)
-            rank = df_sorted[df_sorted['LSOA21NM'].str.contains(lsoa_name, case=False, na=False)]['rank'].values[0]
-
-            total_lsoas = df_unique['LSOA21NM'].nunique()  # Correctly count the number of unique LSOAs
-            ward_name = lsoa_data['WardName'].values[0]  # Get ward name
+        if row is not None:
+            value = df_unique[selected_variable].iat[row]
+            rank = lsoa_ranks(selected_variable)[row]
+            ward_name = df_unique['WardName'].iat[row]  # Get ward name
 
             return [
                 html.H4(f"Information for {lsoa_name}:"),
@@ -521,61 +871,70 @@ def display_lsoa_info(n_clicks, lsoa_name, selected_variable):
             return html.P(f"No information found for LSOA: {lsoa_name}")
     return ""
 
+# Numeric columns for a ward, falling back to the whole borough for 'All Barnet' or an unknown ward
+@functools.lru_cache(maxsize=64)
+def ward_numeric_df(selected_ward):
+    if selected_ward and selected_ward != "All Barnet":
+        ward_data = df[df['WardName'] == selected_ward]
+        if not ward_data.empty:
+            return ward_data[numeric_cols]
+    return df[numeric_cols]
+
+@functools.lru_cache(maxsize=64)
+def ward_correlation(selected_ward):
+    return ward_numeric_df(selected_ward).corr()
+
 @app.callback(
     Output('correlation-scatter-plot', 'figure'),
     [Input('correlation-variable-dropdown', 'value'), Input('correlation-lsoa-dropdown', 'value')]
 )
 def update_correlation_scatter_plot(selected_variable, selected_ward):
-    # Filter numeric data
-    numeric_df = df.select_dtypes(include=[np.number])
-    
-    # If a specific ward is selected, filter the data for that ward
-    if selected_ward and selected_ward != "All Barnet":
-        ward_data = df[df['WardName'] == selected_ward]
-        if not ward_data.empty:
-            numeric_df = ward_data.select_dtypes(include=[np.number])
-
-    # Compute correlations
-    correlation = numeric_df.corr()[selected_variable].sort_values(ascending=False).reset_index()
-    correlation = correlation.rename(columns={'index': 'Variable', selected_variable: 'Correlation'})
-    top_correlation = correlation.head(10).copy()
-
-    # Determine the layout of the subplots dynamically
-    num_plots = len(top_correlation)
-    rows = (num_plots // 5) + (1 if num_plots % 5 else 0)
-    cols = min(num_plots, 5)
-
-    fig = make_subplots(
-        rows=rows, cols=cols,
-        subplot_titles=[short_names.get(var, var) for var in top_correlation['Variable']],
-        horizontal_spacing=0.1,  # Adjust horizontal spacing
-        vertical_spacing=0.3  # Adjust vertical spacing
+    numeric_df = ward_numeric_df(selected_ward)
+
+    # Top 10 correlations with the selected variable, excluding its correlation with itself and undefined (NaN) ones
+    correlation = ward_correlation(selected_ward)[selected_variable].drop(selected_variable).dropna().nlargest(10)
+
+    # A variable that is constant within the ward has no defined correlations to plot
+    if correlation.empty:
+        fig = px.scatter(title=f'No correlations with {display_names[selected_variable]} in {selected_ward}')
+        fig.update_layout(height=400, margin={'l': 40, 'r': 40, 't': 40, 'b': 40})
+        return fig
+
+    top_correlation = correlation.rename_axis('Variable').reset_index(name='Correlation')
+
+    top_variables = top_correlation['Variable'].tolist()
+    top_labels = [display_names[var] for var in top_variables]
+
+    # Long format: one row per (LSOA, variable) so a single WebGL figure can facet by variable
+    scatter_df = numeric_df[top_variables].melt(var_name='Variable', value_name='x')
+    scatter_df['Variable'] = scatter_df['Variable'].map(display_names)
+    scatter_df['y'] = np.tile(numeric_df[selected_variable].to_numpy(), len(top_variables))
+
+    rows = (len(top_variables) // 5) + (1 if len(top_variables) % 5 else 0)
+
+    fig = px.scatter(
+        scatter_df,
+        x='x',
+        y='y',
+        facet_col='Variable',
+        facet_col_wrap=5,
+        facet_col_spacing=0.1,  # Adjust horizontal spacing
+        facet_row_spacing=0.3,  # Adjust vertical spacing
+        category_orders={'Variable': top_labels},
+        render_mode='webgl'
     )
     
-    for i, variable in enumerate(top_correlation['Variable']):
-        row = i // 5 + 1
-        col = i % 5 + 1
-        fig.add_trace(
-            go.Scatter(
-                x=numeric_df[variable],
-                y=numeric_df[selected_variable],
-                mode='markers',
-                name=short_names.get(variable, variable)
-            ),
-            row=row,
-            col=col
-        )
-    
     fig.update_layout(
-        title=f'Scatter Plots of Top Correlations with {short_names.get(selected_variable, selected_variable)} in {selected_ward}',
+        title=f'Scatter Plots of Top Correlations with {display_names[selected_variable]} in {selected_ward}',
         height=400 * rows,
         showlegend=False,
         margin={'l': 40, 'r': 40, 't': 40, 'b': 40},
     )
 
-    for i, variable in enumerate(top_correlation['Variable']):
-        fig['layout'][f'xaxis{i+1}'].update(title=short_names.get(variable, variable), title_font_size=8)
-        fig['layout'][f'yaxis{i+1}'].update(title=short_names.get(selected_variable, selected_variable), title_font_size=8)
+    # Each facet plots a different variable, so don't share x scales and label panels with the variable name only
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split('=', 1)[-1]))
+    fig.update_xaxes(matches=None, showticklabels=True, title_text='')
+    fig.update_yaxes(showticklabels=True, title_text=display_names[selected_variable], title_font_size=8)
     
     return fig
 